@@ -9,6 +9,12 @@ import speech_recognition as sr
 from io import BytesIO
 import tempfile
 import re
+import hashlib
+import json
+import mmap
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Page configuration
 st.set_page_config(
@@ -90,6 +96,52 @@ if 'processed_audio_id' not in st.session_state:
 if 'last_auto_played_msg' not in st.session_state:
     st.session_state.last_auto_played_msg = -1
 
+# Static text that may be read aloud (pre-synthesized into the TTS bundle)
+DISCLAIMER_NOTICE = {
+    'english': ("This AI provides general guidance only. "
+                "Please consult with agricultural experts before making critical farming decisions."),
+    'gujarati': ("આ AI સામાન્ય માર્ગદર્શન આપે છે. "
+                 "મહત્વપૂર્ણ ખેતી સંબંધિત નિર્ણયો લેતા પહેલા કૃષિ વિશેષજ્ઞની સલાહ લો.")
+}
+
+AI_ERROR_REPLY = {
+    'english': "I encountered an error. Please try again.",
+    'gujarati': "ભૂલ થઈ. ફરીથી પ્રયાસ કરો."
+}
+
+AUDIO_ERROR_REPLY = {
+    'english': "Could not understand audio. Please try again.",
+    'gujarati': "અવાજ સમજી શક્યા નહીં. ફરીથી પ્રયાસ કરો."
+}
+
+SAMPLE_QUESTIONS = {
+    'english': [
+        "Which crops are best for drought conditions in Saurashtra?",
+        "How can I save water using drip irrigation?",
+        "What is rainwater harvesting and how do I implement it?",
+        "How to improve soil moisture retention?",
+        "What government schemes are available for drought relief?"
+    ],
+    'gujarati': [
+        "સૌરાષ્ટ્રમાં સૂકાની પરિસ્થિતિમાં કયા પાક શ્રેષ્ઠ છે?",
+        "ટપક સિંચાઈ વડે પાણી કેવી રીતે બચાવી શકાય?",
+        "વરસાદી પાણીનો સંગ્રહ શું છે અને કેવી રીતે કરવો?",
+        "જમીનમાં ભેજ જાળવવા શું કરવું?",
+        "સૂકા માટે કઈ સરકારી યોજનાઓ ઉપલબ્ધ છે?"
+    ]
+}
+
+# On-disk bundle of pre-synthesized audio for the static text above
+TTS_BUNDLE_VERSION = 1
+TTS_BUNDLE_MAGIC = b"JMTTS"
+TTS_BUNDLE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    ".tts_bundle",
+    f"static_audio_v{TTS_BUNDLE_VERSION}.bin"
+)
+TTS_WARMUP_WORKERS = 2
+TTS_REQUEST_TIMEOUT = 10  # seconds per gTTS request
+
 # Drought resilience knowledge base
 KNOWLEDGE_BASE = """
 You are JalMitra AI, a helpful assistant for farmers in Saurashtra, Gujarat facing drought conditions.
@@ -232,6 +284,145 @@ def clean_text_for_speech(text):
     
     return text
 
+def speech_cache_key(cleaned_text, language):
+    """Stable cache key for cleaned text and language (unlike hash(), survives restarts)"""
+    return hashlib.sha256(f"{language}\n{cleaned_text}".encode('utf-8')).hexdigest()
+
+def synthesize_speech(cleaned_text, language='english'):
+    """Generate MP3 bytes for already-cleaned text using gTTS"""
+    # Set language code for gTTS
+    lang_code = 'gu' if language == 'gujarati' else 'en'
+    
+    tts = gTTS(text=cleaned_text, lang=lang_code, slow=False, timeout=TTS_REQUEST_TIMEOUT)
+    audio_buffer = BytesIO()
+    tts.write_to_fp(audio_buffer)
+    return audio_buffer.getvalue()
+
+def static_speech_entries():
+    """Map cache keys to (cleaned text, language) for every static string that can be read aloud"""
+    texts = []
+    for language in ['english', 'gujarati']:
+        texts.extend((language, question) for question in SAMPLE_QUESTIONS[language])
+        texts.append((language, DISCLAIMER_NOTICE[language]))
+        texts.append((language, AI_ERROR_REPLY[language]))
+        texts.append((language, AUDIO_ERROR_REPLY[language]))
+    
+    entries = {}
+    for language, text in texts:
+        cleaned_text = clean_text_for_speech(text)
+        entries[speech_cache_key(cleaned_text, language)] = (cleaned_text, language)
+    return entries
+
+def load_tts_bundle(path=TTS_BUNDLE_PATH):
+    """Memory-map a TTS bundle, returning (buffer, index) or None if missing or unreadable"""
+    try:
+        with open(path, 'rb') as bundle_file:
+            data = mmap.mmap(bundle_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    
+    try:
+        # Layout: magic | version, header length | JSON header | concatenated MP3 data
+        prefix_size = len(TTS_BUNDLE_MAGIC) + struct.calcsize(">HI")
+        if data[:len(TTS_BUNDLE_MAGIC)] != TTS_BUNDLE_MAGIC:
+            raise ValueError("not a TTS bundle")
+        version, header_size = struct.unpack_from(">HI", data, len(TTS_BUNDLE_MAGIC))
+        if version != TTS_BUNDLE_VERSION:
+            raise ValueError(f"unsupported bundle version {version}")
+        
+        header = json.loads(data[prefix_size:prefix_size + header_size].decode('utf-8'))
+        data_start = prefix_size + header_size
+        index = {
+            key: (data_start + offset, length)
+            for key, (offset, length) in header['index'].items()
+        }
+        return data, index
+    except (ValueError, KeyError, TypeError, struct.error):
+        data.close()
+        return None
+
+def missing_speech_keys(bundle):
+    """Static speech keys not yet present in a bundle (new text or clips that failed before)"""
+    entries = static_speech_entries()
+    if bundle is None:
+        return set(entries)
+    return set(entries) - set(bundle[1])
+
+def write_tts_bundle(index, audio_data, path=TTS_BUNDLE_PATH):
+    """Atomically write a TTS bundle so readers never see a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    header = json.dumps({'index': index}).encode('utf-8')
+    
+    fp = tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False, suffix='.tmp')
+    try:
+        with fp:
+            fp.write(TTS_BUNDLE_MAGIC)
+            fp.write(struct.pack(">HI", TTS_BUNDLE_VERSION, len(header)))
+            fp.write(header)
+            fp.write(audio_data)
+        os.replace(fp.name, path)
+    except Exception:
+        # Don't leave a stray temp file behind in the bundle directory
+        os.unlink(fp.name)
+        raise
+
+def build_tts_bundle(bundle=None, path=TTS_BUNDLE_PATH):
+    """Synthesize static speech missing from a bundle on a worker pool and store the merged bundle"""
+    entries = static_speech_entries()
+    with ThreadPoolExecutor(max_workers=TTS_WARMUP_WORKERS) as pool:
+        futures = {
+            key: pool.submit(synthesize_speech, *entries[key])
+            for key in missing_speech_keys(bundle)
+        }
+    
+    index = {}
+    chunks = []
+    offset = 0
+    for key in entries:
+        if key in futures:
+            try:
+                audio_bytes = futures[key].result()
+            except Exception:
+                # Served by on-demand gTTS and retried on next start
+                continue
+        elif bundle is not None:
+            # Keep clips from the previous bundle; stale keys for removed text are dropped
+            bundle_data, bundle_index = bundle
+            bundle_offset, length = bundle_index[key]
+            audio_bytes = bundle_data[bundle_offset:bundle_offset + length]
+        index[key] = (offset, len(audio_bytes))
+        chunks.append(audio_bytes)
+        offset += len(audio_bytes)
+    audio_data = b"".join(chunks)
+    
+    # Persist whatever succeeded so only the missing clips are synthesized next time
+    try:
+        write_tts_bundle(index, audio_data, path)
+        written = load_tts_bundle(path)
+        if written is not None:
+            return written
+    except OSError:
+        pass
+    
+    return audio_data, index
+
+def warm_up_tts_bundle(holder):
+    """Fill in missing static speech off the render path, then swap in the new bundle"""
+    old_bundle = holder['bundle']
+    holder['bundle'] = build_tts_bundle(old_bundle)
+    
+    # Readers copy slices out as bytes, so the old mapping can be released
+    if isinstance(old_bundle[0], mmap.mmap):
+        old_bundle[0].close()
+
+@st.cache_resource(show_spinner=False)
+def get_tts_bundle():
+    """Load the static speech bundle once per server process, warming up missing clips in the background"""
+    holder = {'bundle': load_tts_bundle() or (b"", {})}
+    if missing_speech_keys(holder['bundle']):
+        threading.Thread(target=warm_up_tts_bundle, args=(holder,), daemon=True).start()
+    return holder
+
 def text_to_speech(text, language='english'):
     """Convert text to speech using gTTS with caching"""
     try:
@@ -239,37 +430,38 @@ def text_to_speech(text, language='english'):
         cleaned_text = clean_text_for_speech(text)
         
         # Create a cache key from cleaned text and language
-        cache_key = f"{language}_{hash(cleaned_text)}"
+        cache_key = speech_cache_key(cleaned_text, language)
         
         # Check if audio is already cached
         if cache_key in st.session_state.audio_cache:
             return st.session_state.audio_cache[cache_key]
         
-        # Set language code for gTTS
-        lang_code = 'gu' if language == 'gujarati' else 'en'
+        # Static text is served from the pre-synthesized bundle
+        bundle_data, bundle_index = get_tts_bundle()['bundle']
+        if cache_key in bundle_index:
+            offset, length = bundle_index[cache_key]
+            return bundle_data[offset:offset + length]
         
         # Generate speech with cleaned text
-        tts = gTTS(text=cleaned_text, lang=lang_code, slow=False)
+        audio_bytes = synthesize_speech(cleaned_text, language)
         
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-            tts.save(fp.name)
-            
-            # Read the file and encode to base64
-            with open(fp.name, 'rb') as audio_file:
-                audio_bytes = audio_file.read()
-            
-            # Clean up temp file
-            os.unlink(fp.name)
-            
-            # Cache the audio
-            st.session_state.audio_cache[cache_key] = audio_bytes
-            
-            return audio_bytes
+        # Cache the audio
+        st.session_state.audio_cache[cache_key] = audio_bytes
+        
+        return audio_bytes
     except Exception as e:
         st.warning(f"TTS Error: {str(e)}")
         return None
 
+def play_text(text, language, audio_id):
+    """Speak text through the TTS cache and start playback"""
+    audio_bytes = text_to_speech(text, language)
+    if audio_bytes:
+        st.session_state.audio_playing = True
+        st.session_state.current_audio_id = audio_id
+        autoplay_audio(audio_bytes, show_controls=True)
+    return audio_bytes
+
 def autoplay_audio(audio_bytes, show_controls=False):
     """Auto-play audio in Streamlit with optional controls"""
     if audio_bytes:
@@ -372,7 +564,7 @@ Provide a helpful response in {'Gujarati' if language == 'gujarati' else 'Englis
     except Exception as e:
         error_msg = f"Error getting AI response: {str(e)}"
         st.error(error_msg)
-        return "I encountered an error. Please try again." if language == 'english' else "ભૂલ થઈ. ફરીથી પ્રયાસ કરો."
+        return AI_ERROR_REPLY[language]
 
 def main():
     # Header
@@ -383,6 +575,9 @@ def main():
         </div>
     """, unsafe_allow_html=True)
     
+    # Start the audio warm-up for static text (once per server process, non-blocking)
+    get_tts_bundle()
+    
     # Sidebar
     with st.sidebar:
         st.image("https://cdn-icons-png.flaticon.com/512/1163/1163451.png", width=100)
@@ -478,20 +673,23 @@ def main():
     
     # Display ethical disclaimer
     if language == 'english':
-        st.markdown("""
+        st.markdown(f"""
             <div class="info-box">
-                <strong>⚠️ Important:</strong> This AI provides general guidance only. 
-                Please consult with agricultural experts before making critical farming decisions.
+                <strong>⚠️ Important:</strong> {DISCLAIMER_NOTICE['english']}
             </div>
         """, unsafe_allow_html=True)
     else:
-        st.markdown("""
+        st.markdown(f"""
             <div class="info-box">
-                <strong>⚠️ મહત્વપૂર્ણ:</strong> આ AI સામાન્ય માર્ગદર્શન આપે છે. 
-                મહત્વપૂર્ણ ખેતી સંબંધિત નિર્ણયો લેતા પહેલા કૃષિ વિશેષજ્ઞની સલાહ લો.
+                <strong>⚠️ મહત્વપૂર્ણ:</strong> {DISCLAIMER_NOTICE['gujarati']}
             </div>
         """, unsafe_allow_html=True)
     
+    col_notice1, col_notice2 = st.columns([1, 5])
+    with col_notice1:
+        if st.button("🔊 Play", key="tts_disclaimer"):
+            play_text(DISCLAIMER_NOTICE[language], language, "disclaimer")
+    
     # Display chat messages
     for idx, message in enumerate(st.session_state.messages):
         role_class = "user-message" if message["role"] == "user" else "bot-message"
@@ -509,11 +707,7 @@ def main():
             col_audio1, col_audio2 = st.columns([1, 5])
             with col_audio1:
                 if st.button(f"🔊 Play", key=f"tts_{idx}"):
-                    audio_bytes = text_to_speech(message["content"], language)
-                    if audio_bytes:
-                        st.session_state.audio_playing = True
-                        st.session_state.current_audio_id = f"msg_{idx}"
-                        autoplay_audio(audio_bytes, show_controls=True)
+                    play_text(message["content"], language, f"msg_{idx}")
     
     # Auto-play the last assistant message if enabled
     if st.session_state.auto_play_tts and len(st.session_state.messages) > 0:
@@ -523,38 +717,23 @@ def main():
         # Only auto-play if it's an assistant message and hasn't been played yet
         if (last_message["role"] == "assistant" and 
             st.session_state.last_auto_played_msg < last_idx):
-            audio_bytes = text_to_speech(last_message["content"], language)
-            if audio_bytes:
+            if play_text(last_message["content"], language, f"auto_msg_{last_idx}"):
                 st.session_state.last_auto_played_msg = last_idx
-                st.session_state.audio_playing = True
-                st.session_state.current_audio_id = f"auto_msg_{last_idx}"
-                autoplay_audio(audio_bytes, show_controls=True)
     
     # Sample questions
     if len(st.session_state.messages) == 0:
         st.markdown("### 🌟 Sample Questions" if language == 'english' else "### 🌟 નમૂનાના પ્રશ્નો")
         
-        sample_questions = {
-            'english': [
-                "Which crops are best for drought conditions in Saurashtra?",
-                "How can I save water using drip irrigation?",
-                "What is rainwater harvesting and how do I implement it?",
-                "How to improve soil moisture retention?",
-                "What government schemes are available for drought relief?"
-            ],
-            'gujarati': [
-                "સૌરાષ્ટ્રમાં સૂકાની પરિસ્થિતિમાં કયા પાક શ્રેષ્ઠ છે?",
-                "ટપક સિંચાઈ વડે પાણી કેવી રીતે બચાવી શકાય?",
-                "વરસાદી પાણીનો સંગ્રહ શું છે અને કેવી રીતે કરવો?",
-                "જમીનમાં ભેજ જાળવવા શું કરવું?",
-                "સૂકા માટે કઈ સરકારી યોજનાઓ ઉપલબ્ધ છે?"
-            ]
-        }
-        
         cols = st.columns(2)
-        for idx, question in enumerate(sample_questions[language]):
+        for idx, question in enumerate(SAMPLE_QUESTIONS[language]):
             with cols[idx % 2]:
-                if st.button(question, key=f"sample_{idx}"):
+                col_question, col_play = st.columns([5, 1])
+                with col_play:
+                    if st.button("🔊", key=f"tts_sample_{idx}"):
+                        play_text(question, language, f"sample_{idx}")
+                with col_question:
+                    sample_clicked = st.button(question, key=f"sample_{idx}")
+                if sample_clicked:
                     if not api_key:
                         st.error("⚠️ Please enter your API key first!")
                     else:
@@ -620,7 +799,9 @@ def main():
                         
                         st.rerun()
                     else:
-                        st.error("Could not understand audio. Please try again." if language == 'english' else "અવાજ સમજી શક્યા નહીં. ફરીથી પ્રયાસ કરો.")
+                        st.error(AUDIO_ERROR_REPLY[language])
+                        if st.session_state.auto_play_tts:
+                            play_text(AUDIO_ERROR_REPLY[language], language, "audio_error")
     
     st.markdown("---")
     